@@ -0,0 +1,193 @@
+"""Mede o overhead por chamada das consultas quentes dos repositórios, comparando três
+formas de montar o mesmo statement:
+
+- inline: select()/update() construído a cada chamada (como era antes);
+- lambda_stmt: a alternativa de cache do SQLAlchemy, avaliada e descartada;
+- prebuilt: os statements montados uma vez com bindparam, usados hoje em src.infra.repositories.
+
+Uso: poetry run python -m benchmarks.queries
+
+Roda contra um SQLite temporário (aiosqlite). Além do tempo total, mede o tempo de CPU
+da thread do event loop: o driver roda em outra thread, então esse número isola o custo
+de Python (construção, chave de cache e compilação dos statements, ORM) por consulta.
+"""
+import asyncio
+import datetime
+import os
+import tempfile
+import time
+
+from sqlalchemy import lambda_stmt, update
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from src.domain.models import Base, Reservation, Trip, User
+from src.infra.repositories import ReservationRepository, TripRepository, UserRepository
+
+CALLS = 500
+ROUNDS = 3
+
+
+def _inline(db, user, trip, reservation):
+    async def get_by_username():
+        result = await db.execute(select(User).where(User.username == user.username))
+        return result.scalars().first()
+
+    async def trip_by_id():
+        result = await db.execute(select(Trip).where(Trip.id == trip.id))
+        return result.scalars().first()
+
+    async def reservations(criteria):
+        result = await db.execute(
+            select(Reservation)
+            .where(criteria)
+            .options(selectinload(Reservation.user), selectinload(Reservation.trip))
+        )
+        return result.scalars().all()
+
+    async def seats():
+        await db.execute(
+            update(Trip)
+            .where(Trip.id == trip.id, Trip.available_seats >= 1)
+            .values(available_seats=Trip.available_seats - 1)
+        )
+        await db.execute(
+            update(Trip)
+            .where(Trip.id == trip.id)
+            .values(available_seats=Trip.available_seats + 1)
+        )
+
+    return [
+        get_by_username,
+        trip_by_id,
+        lambda: reservations(Reservation.id == reservation.id),
+        lambda: reservations(Reservation.trip_id == trip.id),
+        lambda: reservations(Reservation.user_id == user.id),
+        seats,
+    ]
+
+
+def _lambda(db, user, trip, reservation):
+    async def get_by_username(username=user.username):
+        result = await db.execute(lambda_stmt(lambda: select(User).where(User.username == username)))
+        return result.scalars().first()
+
+    async def trip_by_id(trip_id=trip.id):
+        result = await db.execute(lambda_stmt(lambda: select(Trip).where(Trip.id == trip_id)))
+        return result.scalars().first()
+
+    async def reservation_by_id(reservation_id=reservation.id):
+        result = await db.execute(lambda_stmt(
+            lambda: select(Reservation)
+            .where(Reservation.id == reservation_id)
+            .options(selectinload(Reservation.user), selectinload(Reservation.trip))
+        ))
+        return result.scalars().first()
+
+    async def reservations_by_trip(trip_id=trip.id):
+        result = await db.execute(lambda_stmt(
+            lambda: select(Reservation)
+            .where(Reservation.trip_id == trip_id)
+            .options(selectinload(Reservation.user), selectinload(Reservation.trip))
+        ))
+        return result.scalars().all()
+
+    async def reservations_by_user(user_id=user.id):
+        result = await db.execute(lambda_stmt(
+            lambda: select(Reservation)
+            .where(Reservation.user_id == user_id)
+            .options(selectinload(Reservation.user), selectinload(Reservation.trip))
+        ))
+        return result.scalars().all()
+
+    async def seats(trip_id=trip.id, n=1):
+        await db.execute(lambda_stmt(
+            lambda: update(Trip)
+            .where(Trip.id == trip_id, Trip.available_seats >= n)
+            .values(available_seats=Trip.available_seats - n)
+        ))
+        await db.execute(lambda_stmt(
+            lambda: update(Trip)
+            .where(Trip.id == trip_id)
+            .values(available_seats=Trip.available_seats + n)
+        ))
+
+    return [get_by_username, trip_by_id, reservation_by_id, reservations_by_trip, reservations_by_user, seats]
+
+
+def _prebuilt(db, user, trip, reservation):
+    async def seats():
+        await TripRepository.take_seats(db, trip.id, 1)
+        await TripRepository.add_seats(db, trip.id, 1)
+
+    return [
+        lambda: UserRepository.get_by_username(db, user.username),
+        lambda: TripRepository.get_by_id(db, trip.id),
+        lambda: ReservationRepository.get_by_id(db, reservation.id),
+        lambda: ReservationRepository.list_by_trip(db, trip.id),
+        lambda: ReservationRepository.list_by_user(db, user.id),
+        seats,
+    ]
+
+
+QUERIES = [
+    "UserRepository.get_by_username",
+    "TripRepository.get_by_id",
+    "ReservationRepository.get_by_id",
+    "ReservationRepository.list_by_trip",
+    "ReservationRepository.list_by_user",
+    "TripRepository.take_seats + add_seats",
+]
+VARIANTS = {"inline": _inline, "lambda_stmt": _lambda, "prebuilt": _prebuilt}
+
+
+async def _measure(call):
+    await call()
+    wall, cpu = [], []
+    for _ in range(ROUNDS):
+        t0, c0 = time.perf_counter(), time.thread_time()
+        for _ in range(CALLS):
+            await call()
+        wall.append((time.perf_counter() - t0) / CALLS)
+        cpu.append((time.thread_time() - c0) / CALLS)
+    return min(cpu) * 1e6, min(wall) * 1e6
+
+
+async def main() -> None:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from src.infra.database import DB_QUERY_CACHE_SIZE
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", query_cache_size=DB_QUERY_CACHE_SIZE)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        user = User(username="bench", email="bench@example.com", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        trip = Trip(
+            driver_id=user.id, origin="A", destination="B", available_seats=10,
+            date=datetime.date(2030, 1, 1), time=datetime.time(10, 0),
+        )
+        db.add(trip)
+        await db.flush()
+        reservation = Reservation(user_id=user.id, trip_id=trip.id)
+        db.add(reservation)
+        await db.commit()
+
+        calls = {name: build(db, user, trip, reservation) for name, build in VARIANTS.items()}
+        print(f"{'µs CPU no loop / total':>40}" + "".join(f"{name:>22}" for name in VARIANTS))
+        for i, query in enumerate(QUERIES):
+            row = []
+            for name in VARIANTS:
+                cpu, wall = await _measure(calls[name][i])
+                row.append(f"{cpu:9.1f} / {wall:9.1f}")
+            print(f"{query:>40}" + "".join(f"{cell:>22}" for cell in row))
+        await db.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""Mede o custo do rate limiter em memória, isolado e dentro de uma requisição.
+
+Uso: poetry run python -m benchmarks.rate_limit
+"""
+import asyncio
+import statistics
+import time
+
+CALLS = 200_000
+KEYS = 10_000
+REQUESTS = 2_000
+
+
+async def _backend_overhead() -> float:
+    from src.infra.rate_limit import InMemoryBackend
+
+    backend = InMemoryBackend()
+    keys = [f"bench:ip:{i}" for i in range(KEYS)]
+    t0 = time.perf_counter()
+    for i in range(CALLS):
+        await backend.consume(keys[i % KEYS], 1_000_000, 1_000.0)
+    return (time.perf_counter() - t0) / CALLS * 1e6
+
+
+async def _request_latency(limited: bool) -> float:
+    from fastapi import Depends, FastAPI
+    from src.infra.rate_limit import RateLimiter
+    import httpx
+
+    app = FastAPI()
+    dependencies = [Depends(RateLimiter("bench", "1000000/1"))] if limited else []
+
+    @app.get("/", dependencies=dependencies)
+    async def root():
+        return {}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        samples = []
+        for _ in range(REQUESTS):
+            t0 = time.perf_counter()
+            await client.get("/")
+            samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1e6
+
+
+async def main() -> None:
+    print(f"InMemoryBackend.consume: {await _backend_overhead():.2f} µs/chamada ({KEYS} chaves)")
+    baseline = await _request_latency(limited=False)
+    limited = await _request_latency(limited=True)
+    print(f"requisição sem limiter: {baseline:.1f} µs, com limiter: {limited:.1f} µs (+{limited - baseline:.1f} µs)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
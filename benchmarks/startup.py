@@ -0,0 +1,77 @@
+"""Mede o cold start da API e a latência do primeiro request, com e sem warm-up.
+
+Uso: poetry run python -m benchmarks.startup
+
+Sem DATABASE_URL definido, usa um SQLite temporário (aiosqlite) como banco local.
+Cada cenário roda em um processo novo para que nada fique em cache entre eles.
+"""
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REQUESTS = 50
+PATH = "/api/v1/trips/1/"
+
+
+async def _run() -> dict:
+    started_at = time.perf_counter()
+    from src.main import app
+    import httpx
+
+    imported_at = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        ready_at = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            t0 = time.perf_counter()
+            await client.get(PATH)
+            first = time.perf_counter() - t0
+            samples = []
+            for _ in range(REQUESTS):
+                t0 = time.perf_counter()
+                await client.get(PATH)
+                samples.append(time.perf_counter() - t0)
+    return {
+        "import_ms": (imported_at - started_at) * 1000,
+        "startup_ms": (ready_at - imported_at) * 1000,
+        "first_request_ms": first * 1000,
+        "steady_request_ms": statistics.median(samples) * 1000,
+    }
+
+
+def _scenario(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--run"],
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    env = {}
+    if "DATABASE_URL" not in os.environ:
+        from sqlalchemy import create_engine
+        from src.domain.models import Base
+
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+        env["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+
+    for name, extra in (("sem warm-up", {"DB_WARMUP_CONNECTIONS": "0"}), ("com warm-up", {})):
+        result = _scenario({**env, **extra})
+        print(f"{name:>12}: " + ", ".join(f"{k}={v:.2f}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    if "--run" in sys.argv:
+        print(json.dumps(asyncio.run(_run())))
+    else:
+        main()
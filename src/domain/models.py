@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, Time, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, Date, Time, ForeignKey, DateTime, Index, UniqueConstraint, JSON
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
@@ -17,6 +17,7 @@ class User(Base):
 
     trips = relationship("Trip", back_populates="driver")
     reservations = relationship("Reservation", back_populates="user")
+    waitlist_entries = relationship("WaitlistEntry", back_populates="user")
 
 class Trip(Base):
     __tablename__ = "trips"
@@ -31,6 +32,7 @@ class Trip(Base):
 
     driver = relationship("User", back_populates="trips")
     reservations = relationship("Reservation", back_populates="trip")
+    waitlist_entries = relationship("WaitlistEntry", back_populates="trip")
 
 class ReservationStatusEnum(PyEnum):
     CONFIRMED = "CONFIRMED" 
@@ -43,6 +45,26 @@ class Reservation(Base):
     trip_id = Column(Integer, ForeignKey("trips.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     status = Column(Enum(ReservationStatusEnum), default=ReservationStatusEnum.CONFIRMED, nullable=False)
+    seats = Column(Integer, nullable=False, default=1, server_default="1")
+    passenger_names = Column(JSON, nullable=True)
 
     user = relationship("User", back_populates="reservations")
-    trip = relationship("Trip", back_populates="reservations")
\ No newline at end of file
+    trip = relationship("Trip", back_populates="reservations")
+
+class WaitlistEntry(Base):
+    __tablename__ = "waitlist_entries"
+    # A ordem da fila é a do id: a posição é quantas entradas da viagem têm id <= o da entrada.
+    __table_args__ = (
+        UniqueConstraint("trip_id", "user_id", name="uq_waitlist_entries_trip_id_user_id"),
+        Index("ix_waitlist_entries_trip_id_id", "trip_id", "id"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    trip_id = Column(Integer, ForeignKey("trips.id"), nullable=False)
+    # Um grupo espera junto: só é promovido quando couberem todos os assentos.
+    seats = Column(Integer, nullable=False, default=1, server_default="1")
+    passenger_names = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    user = relationship("User", back_populates="waitlist_entries")
+    trip = relationship("Trip", back_populates="waitlist_entries")
@@ -1,5 +1,5 @@
 from enum import Enum
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from typing import Optional, List
 from datetime import date, time, datetime
 
@@ -16,7 +16,7 @@ class UserOut(UserBase):
     created_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class TripBase(BaseModel):
     origin: str
@@ -26,7 +26,7 @@ class TripBase(BaseModel):
     available_seats: int
 
 class TripCreate(TripBase):
-    pass
+    available_seats: int = Field(..., ge=0)
 
 class TripOut(TripBase):
     id: int
@@ -34,13 +34,18 @@ class TripOut(TripBase):
     created_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class ReservationBase(BaseModel):
-    pass
+    seats: int = Field(1, ge=1)
+    passenger_names: Optional[List[str]] = None
 
 class ReservationCreate(ReservationBase):
-    pass
+    @model_validator(mode="after")
+    def check_passenger_names(self):
+        if self.passenger_names is not None and len(self.passenger_names) != self.seats:
+            raise ValueError("passenger_names deve ter um nome para cada assento reservado")
+        return self
 
 class ReservationStatus(str, Enum):
     CONFIRMED = "CONFIRMED"
@@ -57,7 +62,31 @@ class ReservationOut(ReservationBase):
     trip: TripOut 
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class ReservationUpdate(BaseModel):
-    new_trip_id: int
\ No newline at end of file
+    new_trip_id: int
+
+class ReservationCancel(BaseModel):
+    # Sem `seats`, cancela a reserva inteira; com `seats`, libera só essa quantidade de assentos.
+    seats: Optional[int] = Field(None, ge=1)
+
+class PassengerOut(UserOut):
+    seats: int
+    passenger_names: Optional[List[str]] = None
+
+class WaitlistEntryCreate(ReservationCreate):
+    pass
+
+class WaitlistEntryOut(ReservationBase):
+    id: int
+    user_id: int
+    trip_id: int
+    created_at: datetime
+    # 0 com `reservation_id` preenchido: uma vaga abriu enquanto entrava na fila e a reserva já foi feita.
+    position: int
+    reservation_id: Optional[int] = None
+
+class WaitlistPosition(BaseModel):
+    trip_id: int
+    position: int
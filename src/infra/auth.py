@@ -5,9 +5,9 @@ from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from src.domain.models import User
 from src.infra.database import get_db
+from src.infra.repositories import UserRepository
 import os
 
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey")
@@ -25,8 +25,7 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
-    result = await db.execute(select(User).where(User.username == username))
-    user = result.scalars().first()
+    user = await UserRepository.get_by_username(db, username)
     if user and verify_password(password, user.hashed_password):
         return user
     return None
@@ -51,8 +50,7 @@ async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depe
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    result = await db.execute(select(User).where(User.username == username))
-    user = result.scalars().first()
+    user = await UserRepository.get_by_username(db, username)
     if user is None:
         raise credentials_exception
     return user
@@ -0,0 +1,118 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, status
+from src.domain.models import User
+from src.infra.auth import get_current_active_user
+import math
+import os
+import time
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# Quantos proxies confiáveis (ex.: o ingress) ficam na frente da API. Cada um acrescenta o
+# endereço de quem o chamou ao fim do X-Forwarded-For, então o IP do cliente é a N-ésima
+# entrada contada da direita; o que estiver mais à esquerda é controlado pelo cliente.
+# 0 ignora o cabeçalho e usa o IP da conexão.
+RATE_LIMIT_TRUSTED_HOPS = int(os.getenv("RATE_LIMIT_TRUSTED_HOPS", "0"))
+# Limites no formato "<requisições>/<segundos>": a capacidade do bucket é o número de
+# requisições e ele é reabastecido uniformemente ao longo do período.
+RATE_LIMIT_LOGIN = os.getenv("RATE_LIMIT_LOGIN", "10/60")
+RATE_LIMIT_RESERVE = os.getenv("RATE_LIMIT_RESERVE", "20/60")
+
+
+class RateLimitBackend(ABC):
+    """Armazena os buckets de token. Implementações compartilhadas (ex.: Redis) permitem
+    aplicar o mesmo limite entre várias réplicas da API."""
+
+    @abstractmethod
+    async def consume(self, key: str, capacity: int, refill_rate: float) -> float:
+        """Consome um token do bucket `key`.
+
+        Retorna 0 se a requisição é permitida, ou quantos segundos faltam para o próximo token.
+        """
+
+
+class InMemoryBackend(RateLimitBackend):
+    """Buckets no processo atual; cada worker/réplica tem seus próprios limites."""
+
+    def __init__(self, clock=time.monotonic, sweep_every: int = 10_000):
+        self._buckets = {}
+        self._clock = clock
+        self._sweep_every = sweep_every
+        self._calls = 0
+
+    async def consume(self, key: str, capacity: int, refill_rate: float) -> float:
+        # Sem await no meio: a leitura e a escrita do bucket são atômicas no event loop.
+        now = self._clock()
+        tokens, updated_at, _ = self._buckets.get(key, (capacity, now, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+        self._calls += 1
+        if self._calls >= self._sweep_every:
+            self._sweep(now)
+
+        retry_after = 0 if tokens >= 1 else (1 - tokens) / refill_rate
+        if not retry_after:
+            tokens -= 1
+        self._buckets[key] = (tokens, now, now + (capacity - tokens) / refill_rate)
+        return retry_after
+
+    def _sweep(self, now: float) -> None:
+        # Um bucket que já reabasteceu por completo equivale a um bucket ausente.
+        self._calls = 0
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items() if bucket[2] > now
+        }
+
+
+backend: RateLimitBackend = InMemoryBackend()
+
+
+def set_backend(new_backend: RateLimitBackend) -> None:
+    global backend
+    backend = new_backend
+
+
+def parse_rate(rate: str):
+    requests, seconds = rate.split("/")
+    return int(requests), int(requests) / float(seconds)
+
+
+def client_ip(request: Request, trusted_hops: Optional[int] = None) -> str:
+    trusted_hops = RATE_LIMIT_TRUSTED_HOPS if trusted_hops is None else trusted_hops
+    if trusted_hops > 0:
+        forwarded = [ip.strip() for ip in request.headers.get("x-forwarded-for", "").split(",") if ip.strip()]
+        if len(forwarded) >= trusted_hops:
+            return forwarded[-trusted_hops]
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    """Dependência que limita a rota por IP do cliente.
+
+    Uso: `@router.post(..., dependencies=[Depends(RateLimiter("login", "10/60"))])`
+    """
+
+    def __init__(self, scope: str, rate: str):
+        self.scope = scope
+        self.capacity, self.refill_rate = parse_rate(rate)
+
+    async def check(self, key: str) -> None:
+        if not RATE_LIMIT_ENABLED:
+            return
+        retry_after = await backend.consume(f"{self.scope}:{key}", self.capacity, self.refill_rate)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Muitas requisições. Tente novamente mais tarde.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    async def __call__(self, request: Request) -> None:
+        await self.check(f"ip:{client_ip(request)}")
+
+
+class UserRateLimiter(RateLimiter):
+    """Dependência que limita a rota por usuário autenticado."""
+
+    async def __call__(self, current_user: User = Depends(get_current_active_user)) -> None:
+        await self.check(f"user:{current_user.id}")
@@ -1,15 +1,69 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload 
 from sqlalchemy.future import select
-from sqlalchemy import update, delete 
+from sqlalchemy import update, delete, func, bindparam 
 from sqlalchemy import delete as sqla_delete 
-from src.domain.models import User, Trip, Reservation
+from src.domain.models import User, Trip, Reservation, ReservationStatusEnum, WaitlistEntry
 from typing import List, Optional
 
+# Consultas quentes montadas uma única vez com bindparam: cada chamada só passa os
+# parâmetros, sem reconstruir select()/update() nem recalcular a chave de cache, e a
+# compilação fica no cache do engine (tamanho em DB_QUERY_CACHE_SIZE).
+# lambda_stmt foi medido e descartado: com o ORM ele clona o statement a cada chamada
+# para substituir os parâmetros do closure e ficou mais lento que o select() comum.
+_USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+
+_TRIP_BY_ID = select(Trip).where(Trip.id == bindparam("trip_id"))
+
+# Com bindparam no WHERE o ORM não consegue avaliar quais objetos da sessão foram
+# atingidos; RETURNING Trip com populate_existing atualiza o Trip já carregado na sessão.
+_TRIP_ADD_SEATS = (
+    update(Trip)
+    .where(Trip.id == bindparam("trip_id"))
+    .values(available_seats=Trip.available_seats + bindparam("seats"))
+    .returning(Trip)
+    .execution_options(synchronize_session=False, populate_existing=True)
+)
+
+_TRIP_TAKE_SEATS = (
+    update(Trip)
+    .where(Trip.id == bindparam("trip_id"), Trip.available_seats >= bindparam("seats"))
+    .values(available_seats=Trip.available_seats - bindparam("seats"))
+    .returning(Trip)
+    .execution_options(synchronize_session=False, populate_existing=True)
+)
+
+_RESERVATION_BY_ID = (
+    select(Reservation)
+    .where(Reservation.id == bindparam("reservation_id"))
+    .options(selectinload(Reservation.user), selectinload(Reservation.trip))
+)
+
+_RESERVATIONS_BY_USER = (
+    select(Reservation)
+    .where(Reservation.user_id == bindparam("user_id"))
+    .options(selectinload(Reservation.user), selectinload(Reservation.trip))
+)
+
+_RESERVATIONS_BY_TRIP = (
+    select(Reservation)
+    .options(selectinload(Reservation.user), selectinload(Reservation.trip))
+    .where(Reservation.trip_id == bindparam("trip_id"))
+)
+
+_CONFIRMED_RESERVATIONS_BY_TRIP = (
+    select(Reservation)
+    .options(selectinload(Reservation.user))
+    .where(
+        Reservation.trip_id == bindparam("trip_id"),
+        Reservation.status == ReservationStatusEnum.CONFIRMED,
+    )
+)
+
 class UserRepository:
     @staticmethod
     async def get_by_username(db: AsyncSession, username: str) -> Optional[User]:
-        result = await db.execute(select(User).where(User.username == username))
+        result = await db.execute(_USER_BY_USERNAME, {"username": username})
         return result.scalars().first()
 
     @staticmethod
@@ -27,7 +81,7 @@ class TripRepository:
 
     @staticmethod
     async def get_by_id(db: AsyncSession, trip_id: int) -> Optional[Trip]:
-        result = await db.execute(select(Trip).where(Trip.id == trip_id))
+        result = await db.execute(_TRIP_BY_ID, {"trip_id": trip_id})
         return result.scalars().first()
 
     @staticmethod
@@ -38,14 +92,31 @@ class TripRepository:
         return trip
 
     @staticmethod
-    async def update(db: AsyncSession, trip_id: int, data: dict) -> Optional[Trip]:
+    async def update(db: AsyncSession, trip_id: int, data: dict, commit: bool = True) -> Optional[Trip]:
         await db.execute(update(Trip).where(Trip.id == trip_id).values(**data))
-        await db.commit()
+        if commit:
+            await db.commit()
         return await TripRepository.get_by_id(db, trip_id)
 
+    @staticmethod
+    async def add_seats(db: AsyncSession, trip_id: int, seats: int) -> None:
+        # Incremento atômico no banco; não faz commit para compor com outras operações.
+        result = await db.execute(_TRIP_ADD_SEATS, {"trip_id": trip_id, "seats": seats})
+        # Consumir as linhas do RETURNING é o que atualiza o Trip carregado na sessão.
+        result.scalars().all()
+
+    @staticmethod
+    async def take_seats(db: AsyncSession, trip_id: int, seats: int) -> bool:
+        # Decremento condicional: ou reserva todos os assentos pedidos, ou nenhum. Não faz commit.
+        result = await db.execute(_TRIP_TAKE_SEATS, {"trip_id": trip_id, "seats": seats})
+        return result.scalars().first() is not None
+
     @staticmethod
     async def delete(db: AsyncSession, trip_id: int) -> None:
-        # Deleta as reservas associadas primeiro
+        # Deleta as reservas e a lista de espera associadas primeiro
+        await db.execute(
+            sqla_delete(WaitlistEntry).where(WaitlistEntry.trip_id == trip_id)
+        )
         await db.execute(
             sqla_delete(Reservation).where(Reservation.trip_id == trip_id)
         )
@@ -66,28 +137,25 @@ class ReservationRepository:
     @staticmethod
     async def list_by_user(db: AsyncSession, user_id: int) -> List[Reservation]:
 
-        result = await db.execute(
-            select(Reservation)
-            .where(Reservation.user_id == user_id)
-            .options(selectinload(Reservation.user), selectinload(Reservation.trip)) 
-        )
+        result = await db.execute(_RESERVATIONS_BY_USER, {"user_id": user_id})
         return result.scalars().all()
 
     @staticmethod
     async def list_by_trip(db: AsyncSession, trip_id: int) -> List[Reservation]:
 
-        stmt = (
-            select(Reservation)
-            .options(selectinload(Reservation.user), selectinload(Reservation.trip))
-            .where(Reservation.trip_id == trip_id)
-        )
-        result = await db.execute(stmt)
+        result = await db.execute(_RESERVATIONS_BY_TRIP, {"trip_id": trip_id})
+        return result.scalars().all()
+
+    @staticmethod
+    async def list_confirmed_by_trip(db: AsyncSession, trip_id: int) -> List[Reservation]:
+        result = await db.execute(_CONFIRMED_RESERVATIONS_BY_TRIP, {"trip_id": trip_id})
         return result.scalars().all()
     
     @staticmethod
-    async def update(db: AsyncSession, reservation_id: int, data: dict) -> Optional[Reservation]:
+    async def update(db: AsyncSession, reservation_id: int, data: dict, commit: bool = True) -> Optional[Reservation]:
         await db.execute(update(Reservation).where(Reservation.id == reservation_id).values(**data))
-        await db.commit()
+        if commit:
+            await db.commit()
 
         result = await db.execute(
             select(Reservation)
@@ -97,11 +165,185 @@ class ReservationRepository:
         return result.scalars().first()
 
     @staticmethod
-    async def get_by_id(db: AsyncSession, reservation_id: int) -> Optional[Reservation]:
+    async def cancel(db: AsyncSession, reservation_id: int, trip_id: int, seats: Optional[int] = None) -> Optional[int]:
+        """Cancela a reserva se ela ainda está confirmada na viagem `trip_id` (e com exatamente
+        `seats` assentos, se informado). Retorna quantos assentos foram liberados, ou None se
+        a reserva mudou desde que foi lida. Não faz commit."""
+        stmt = update(Reservation).where(
+            Reservation.id == reservation_id,
+            Reservation.trip_id == trip_id,
+            Reservation.status == ReservationStatusEnum.CONFIRMED,
+        )
+        if seats is not None:
+            stmt = stmt.where(Reservation.seats == seats)
+        result = await db.execute(
+            stmt.values(status=ReservationStatusEnum.CANCELLED).returning(Reservation.seats)
+        )
+        return result.scalar_one_or_none()
 
+    @staticmethod
+    async def remove_seats(db: AsyncSession, reservation_id: int, trip_id: int, seats: int) -> Optional[int]:
+        """Tira `seats` assentos da reserva confirmada, desde que ainda sobre pelo menos um.
+        Retorna quantos assentos restaram, ou None se não foi possível. Não faz commit."""
+        result = await db.execute(
+            update(Reservation)
+            .where(
+                Reservation.id == reservation_id,
+                Reservation.trip_id == trip_id,
+                Reservation.status == ReservationStatusEnum.CONFIRMED,
+                Reservation.seats > seats,
+            )
+            .values(seats=Reservation.seats - seats)
+            .returning(Reservation.seats)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def move(db: AsyncSession, reservation_id: int, old_trip_id: int, new_trip_id: int, seats: int) -> bool:
+        # Só move se a reserva continua confirmada, na viagem original e com os mesmos assentos.
+        result = await db.execute(
+            update(Reservation)
+            .where(
+                Reservation.id == reservation_id,
+                Reservation.trip_id == old_trip_id,
+                Reservation.status == ReservationStatusEnum.CONFIRMED,
+                Reservation.seats == seats,
+            )
+            .values(trip_id=new_trip_id)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    async def get_confirmed(db: AsyncSession, trip_id: int, user_id: int) -> Optional[Reservation]:
         result = await db.execute(
             select(Reservation)
-            .where(Reservation.id == reservation_id)
-            .options(selectinload(Reservation.user), selectinload(Reservation.trip)) 
+            .where(
+                Reservation.trip_id == trip_id,
+                Reservation.user_id == user_id,
+                Reservation.status == ReservationStatusEnum.CONFIRMED,
+            )
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, reservation_id: int) -> Optional[Reservation]:
+
+        result = await db.execute(_RESERVATION_BY_ID, {"reservation_id": reservation_id})
+        return result.scalars().first()
+
+class WaitlistRepository:
+    @staticmethod
+    async def create(db: AsyncSession, entry: WaitlistEntry, commit: bool = True) -> WaitlistEntry:
+        db.add(entry)
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
+        await db.refresh(entry)
+        return entry
+
+    @staticmethod
+    async def get(db: AsyncSession, trip_id: int, user_id: int) -> Optional[WaitlistEntry]:
+        result = await db.execute(
+            select(WaitlistEntry)
+            .where(WaitlistEntry.trip_id == trip_id, WaitlistEntry.user_id == user_id)
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_position(db: AsyncSession, trip_id: int, user_id: int) -> int:
+        # Uma única contagem sobre o índice (trip_id, id); retorna 0 se o usuário não está na fila.
+        own_id = (
+            select(WaitlistEntry.id)
+            .where(WaitlistEntry.trip_id == trip_id, WaitlistEntry.user_id == user_id)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(func.count())
+            .select_from(WaitlistEntry)
+            .where(WaitlistEntry.trip_id == trip_id, WaitlistEntry.id <= own_id)
         )
-        return result.scalars().first()
\ No newline at end of file
+        return result.scalar_one()
+
+    @staticmethod
+    async def delete(db: AsyncSession, trip_id: int, user_id: int, commit: bool = True) -> None:
+        await db.execute(
+            sqla_delete(WaitlistEntry)
+            .where(WaitlistEntry.trip_id == trip_id, WaitlistEntry.user_id == user_id)
+        )
+        if commit:
+            await db.commit()
+
+    @staticmethod
+    async def promote(db: AsyncSession, trip_id: int) -> List[Reservation]:
+        """Ocupa as vagas livres da viagem com os primeiros da lista de espera, por ordem de chegada.
+
+        Entradas de usuários que já têm reserva confirmada na viagem são descartadas antes.
+        Cada promoção sai de `available_seats` pelo mesmo decremento condicional da reserva
+        direta, então a viagem nunca fica com vagas negativas. A fila é estrita: se o grupo
+        da vez não cabe nas vagas livres, ninguém atrás dele passa na frente. Não faz commit.
+        """
+        await db.execute(
+            sqla_delete(WaitlistEntry)
+            .where(
+                WaitlistEntry.trip_id == trip_id,
+                WaitlistEntry.user_id.in_(
+                    select(Reservation.user_id).where(
+                        Reservation.trip_id == trip_id,
+                        Reservation.status == ReservationStatusEnum.CONFIRMED,
+                    )
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        # Trava a linha da viagem: promoções concorrentes na mesma viagem rodam uma de cada vez.
+        result = await db.execute(
+            select(Trip.available_seats).where(Trip.id == trip_id).with_for_update()
+        )
+        available = result.scalar_one_or_none() or 0
+        if available <= 0:
+            return []
+
+        result = await db.execute(
+            select(WaitlistEntry)
+            .where(WaitlistEntry.trip_id == trip_id)
+            .order_by(WaitlistEntry.id)
+            # Cada entrada ocupa pelo menos um assento: mais que `available` nunca cabem.
+            .limit(available)
+        )
+        entries = result.scalars().all()
+
+        promoted = []
+        for entry in entries:
+            if not await TripRepository.take_seats(db, trip_id, entry.seats):
+                break
+            reservation = Reservation(
+                user_id=entry.user_id,
+                trip_id=trip_id,
+                seats=entry.seats,
+                passenger_names=entry.passenger_names,
+            )
+            db.add(reservation)
+            await db.delete(entry)
+            promoted.append(reservation)
+        await db.flush()
+        return promoted
+
+    @staticmethod
+    async def release_seats(db: AsyncSession, trip_id: int, seats: int = 1) -> List[Reservation]:
+        """Devolve `seats` vagas à viagem e promove os primeiros da lista de espera.
+
+        Não faz commit: deve rodar na mesma transação que liberou as vagas.
+        """
+        await TripRepository.add_seats(db, trip_id, seats)
+        return await WaitlistRepository.promote(db, trip_id)
+
+async def warm_up_queries(db: AsyncSession) -> None:
+    # Executa as consultas quentes com chaves inexistentes: nada é retornado, mas os
+    # statements ficam compilados e preparados na conexão antes do primeiro request.
+    await UserRepository.get_by_username(db, "")
+    await TripRepository.get_by_id(db, 0)
+    await ReservationRepository.get_by_id(db, 0)
+    await ReservationRepository.list_confirmed_by_trip(db, 0)
+    await ReservationRepository.list_by_user(db, 0)
+    await WaitlistRepository.get_position(db, 0, 0)
@@ -1,6 +1,32 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from src.infra.database import engine, warm_up, DB_WARMUP_RETRY_SECONDS
+from src.infra.repositories import warm_up_queries
 from src.presentation import routes
+import asyncio
+import logging
+import time
 
-app = FastAPI(title="Vanbora - Sistema de Reserva de Vans")
+logger = logging.getLogger(__name__)
 
-app.include_router(routes.router) 
\ No newline at end of file
+async def _retry_warm_up(app: FastAPI):
+    # Uma única tarefa em segundo plano refaz o warm-up; o readiness só lê o estado.
+    while not await warm_up(warm_up_queries):
+        await asyncio.sleep(DB_WARMUP_RETRY_SECONDS)
+    app.state.ready = True
+    logger.info("Warm-up concluído após nova tentativa")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started_at = time.perf_counter()
+    app.state.ready = await warm_up(warm_up_queries)
+    logger.info("Warm-up concluído em %.1f ms (pronto: %s)", (time.perf_counter() - started_at) * 1000, app.state.ready)
+    retry_task = None if app.state.ready else asyncio.create_task(_retry_warm_up(app))
+    yield
+    if retry_task:
+        retry_task.cancel()
+    await engine.dispose()
+
+app = FastAPI(title="Vanbora - Sistema de Reserva de Vans", lifespan=lifespan)
+
+app.include_router(routes.router)
@@ -3,11 +3,12 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.infra.database import get_db
 from src.infra.auth import authenticate_user, create_access_token
+from src.infra.rate_limit import RateLimiter, RATE_LIMIT_LOGIN
 from datetime import timedelta
 
 router = APIRouter()
 
-@router.post("/token/")
+@router.post("/token/", dependencies=[Depends(RateLimiter("login", RATE_LIMIT_LOGIN))])
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
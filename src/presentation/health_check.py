@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.ext.asyncio import AsyncSession
-from src.infra.database import get_db
-from src.infra.auth import authenticate_user, create_access_token
-from datetime import timedelta
+from fastapi import APIRouter, HTTPException, Request, status
+from src.infra.database import ping
 
 router = APIRouter()
 
 @router.get("/health/")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@router.get("/ready/")
+async def readiness_check(request: Request):
+    # Se o warm-up do startup falhou, ele é refeito em segundo plano (ver src.main);
+    # aqui só lemos o estado e fazemos um ping limitado por DB_PING_TIMEOUT_SECONDS.
+    if not getattr(request.app.state, "ready", False) or not await ping():
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Serviço ainda não está pronto.")
+    return {"status": "ready"}
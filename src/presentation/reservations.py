@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from src.domain.schemas import ReservationOut, ReservationStatus, ReservationUpdate
+from typing import List, Optional
+from src.domain.schemas import ReservationCreate, ReservationOut, ReservationStatus, ReservationUpdate, ReservationCancel
 from src.domain.models import Reservation, Trip, User, ReservationStatusEnum
 from src.infra.database import get_db
 from src.infra.auth import get_current_active_user
-from src.infra.repositories import ReservationRepository, TripRepository
+from src.infra.rate_limit import UserRateLimiter, RATE_LIMIT_RESERVE
+from src.infra.repositories import ReservationRepository, TripRepository, WaitlistRepository
 from datetime import datetime, timedelta, timezone
 
 router = APIRouter()
@@ -13,21 +14,41 @@ router = APIRouter()
 CANCELLATION_WINDOW_HOURS = 2
 ENABLE_ALTERATION_DEADLINE = True
 
-@router.post("/trips/{trip_id}/reserve/", response_model=ReservationOut)
-async def reserve_trip(trip_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+@router.post(
+    "/trips/{trip_id}/reserve/",
+    response_model=ReservationOut,
+    dependencies=[Depends(UserRateLimiter("reserve", RATE_LIMIT_RESERVE))],
+)
+async def reserve_trip(
+    trip_id: int,
+    reservation_in: Optional[ReservationCreate] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    reservation_in = reservation_in or ReservationCreate()
+
     trip = await TripRepository.get_by_id(db, trip_id)
-    if not trip or trip.available_seats <= 0:
+    if not trip or trip.available_seats < reservation_in.seats:
         raise HTTPException(status_code=400, detail="Trip not available or full")
     
-    reservations = await ReservationRepository.list_by_trip(db, trip_id)
-    if any(r.user_id == current_user.id for r in reservations):
+    if await ReservationRepository.get_confirmed(db, trip_id, current_user.id):
         raise HTTPException(status_code=400, detail="You already have a reservation for this trip")
     
-    reservation = Reservation(user_id=current_user.id, trip_id=trip_id)
-    reservation = await ReservationRepository.create(db, reservation) 
-    
+    # Todos os assentos do grupo saem num único decremento condicional e entram
+    # num único insert, na mesma transação: não existe reserva parcial.
+    if not await TripRepository.take_seats(db, trip_id, reservation_in.seats):
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Trip not available or full")
 
-    await TripRepository.update(db, trip_id, {"available_seats": trip.available_seats - 1})
+    reservation = Reservation(
+        user_id=current_user.id,
+        trip_id=trip_id,
+        seats=reservation_in.seats,
+        passenger_names=reservation_in.passenger_names,
+    )
+    # Quem estava na lista de espera e reservou direto sai da fila na mesma transação.
+    await WaitlistRepository.delete(db, trip_id, current_user.id, commit=False)
+    reservation = await ReservationRepository.create(db, reservation) 
     
     return reservation
 
@@ -40,6 +61,7 @@ async def list_reservations(db: AsyncSession = Depends(get_db), current_user: Us
 @router.put("/reservations/{reservation_id}/cancel/", status_code=status.HTTP_204_NO_CONTENT)
 async def cancel_reservation(
     reservation_id: int,
+    cancel_payload: Optional[ReservationCancel] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user) 
 ):
@@ -90,13 +112,40 @@ async def cancel_reservation(
             detail=f"Não foi possível cancelar a reserva: o prazo de cancelamento (até {CANCELLATION_WINDOW_HOURS} horas antes da viagem) já expirou."
         )
 
-    updated_reservation = await ReservationRepository.update(
-        db, reservation_id, {"status": ReservationStatusEnum.CANCELLED}
-    )
+    seats = cancel_payload.seats if cancel_payload and cancel_payload.seats else None
+    if seats is not None and seats > reservation.seats:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A reserva tem apenas {reservation.seats} assento(s)."
+        )
 
-    await TripRepository.update(
-        db, trip.id, {"available_seats": trip.available_seats + 1}
-    )
+    # Os assentos liberados vêm de UPDATEs condicionais, não do que foi lido acima: duas
+    # requisições concorrentes nunca liberam mais assentos do que a reserva realmente tinha.
+    if seats is None:
+        released = await ReservationRepository.cancel(db, reservation_id, trip.id)
+    else:
+        remaining = await ReservationRepository.remove_seats(db, reservation_id, trip.id, seats)
+        if remaining is None:
+            released = await ReservationRepository.cancel(db, reservation_id, trip.id, seats=seats)
+        else:
+            released = seats
+            # Cancelamento parcial: a reserva continua confirmada com menos assentos,
+            # removendo os últimos nomes de passageiros informados.
+            if reservation.passenger_names and len(reservation.passenger_names) > remaining:
+                await ReservationRepository.update(
+                    db, reservation_id, {"passenger_names": reservation.passenger_names[:remaining]}, commit=False
+                )
+
+    if released is None:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A reserva foi alterada por outra requisição. Tente novamente."
+        )
+
+    # As vagas liberadas vão para os primeiros da lista de espera, na mesma transação.
+    await WaitlistRepository.release_seats(db, trip.id, released)
+    await db.commit()
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -174,7 +223,7 @@ async def edit_reservation(
         )
 
 
-    if new_trip.available_seats <= 0:
+    if new_trip.available_seats < reservation.seats:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A viagem escolhida não tem mais vagas disponíveis."
@@ -188,10 +237,22 @@ async def edit_reservation(
             detail=f"Não é possível editar para uma viagem que já iniciou ou passou. Nova Viagem: {new_trip_datetime_utc}, Agora: {now_utc}"
         )
     
-    await TripRepository.update(db, old_trip.id, {"available_seats": old_trip.available_seats + 1})
-    updated_reservation = await ReservationRepository.update(
-        db, reservation_id, {"trip_id": new_trip.id}
-    )
-    await TripRepository.update(db, new_trip.id, {"available_seats": new_trip.available_seats - 1})
-    
-    return updated_reservation 
\ No newline at end of file
+    if not await ReservationRepository.move(db, reservation_id, old_trip.id, new_trip.id, reservation.seats):
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A reserva foi alterada por outra requisição. Tente novamente."
+        )
+    if not await TripRepository.take_seats(db, new_trip.id, reservation.seats):
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A viagem escolhida não tem mais vagas disponíveis."
+        )
+    await WaitlistRepository.delete(db, new_trip.id, current_user.id, commit=False)
+    # As vagas liberadas na viagem original vão para os primeiros da lista de espera, na mesma transação.
+    await WaitlistRepository.release_seats(db, old_trip.id, reservation.seats)
+    await db.commit()
+    await db.refresh(reservation, attribute_names=["trip"])
+
+    return reservation 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from src.presentation import auth, users, trips, reservations, health_check
+from src.presentation import auth, users, trips, reservations, waitlist, health_check
 
 router = APIRouter()
 
@@ -7,4 +7,5 @@ router.include_router(health_check.router, prefix="/api/v1", tags=["health"])
 router.include_router(auth.router, prefix="/api/v1", tags=["auth"])
 router.include_router(users.router, prefix="/api/v1", tags=["users"])
 router.include_router(trips.router, prefix="/api/v1", tags=["trips"])
-router.include_router(reservations.router, prefix="/api/v1", tags=["reservations"])
\ No newline at end of file
+router.include_router(reservations.router, prefix="/api/v1", tags=["reservations"])
+router.include_router(waitlist.router, prefix="/api/v1", tags=["waitlist"])
\ No newline at end of file
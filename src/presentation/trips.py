@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from src.domain.schemas import TripCreate, TripOut, UserOut
+from src.domain.schemas import TripCreate, TripOut, PassengerOut, UserOut
 from src.domain.models import Trip, Reservation, User
 from src.infra.database import get_db
 from src.infra.auth import get_current_active_user, get_current_driver
-from src.infra.repositories import TripRepository, ReservationRepository
+from src.infra.repositories import TripRepository, ReservationRepository, WaitlistRepository
 
 router = APIRouter()
 
@@ -35,8 +35,12 @@ async def update_trip(trip_id: int, trip_in: TripCreate, db: AsyncSession = Depe
     trip = await TripRepository.get_by_id(db, trip_id)
     if not trip or trip.driver_id != current_driver.id:
         raise HTTPException(status_code=404, detail="Trip not found or not allowed")
-    updated = await TripRepository.update(db, trip_id, trip_in.dict())
-    return updated
+    await TripRepository.update(db, trip_id, trip_in.dict(), commit=False)
+    # Vagas abertas pelo motorista vão primeiro para a lista de espera, na mesma transação.
+    await WaitlistRepository.promote(db, trip_id)
+    await db.commit()
+    await db.refresh(trip)
+    return trip
 
 @router.delete("/trips/{trip_id}/", status_code=204)
 async def delete_trip(trip_id: int, db: AsyncSession = Depends(get_db), current_driver: User = Depends(get_current_driver)):
@@ -46,11 +50,17 @@ async def delete_trip(trip_id: int, db: AsyncSession = Depends(get_db), current_
     await TripRepository.delete(db, trip_id)
     return
 
-@router.get("/trips/{trip_id}/passengers/", response_model=List[UserOut])
+@router.get("/trips/{trip_id}/passengers/", response_model=List[PassengerOut])
 async def list_passengers(trip_id: int, db: AsyncSession = Depends(get_db), current_driver: User = Depends(get_current_driver)):
     trip = await TripRepository.get_by_id(db, trip_id)
     if not trip or trip.driver_id != current_driver.id:
         raise HTTPException(status_code=404, detail="Trip not found or not allowed")
-    reservations = await ReservationRepository.list_by_trip(db, trip_id)
-    passengers = [r.user for r in reservations]
-    return passengers 
\ No newline at end of file
+    reservations = await ReservationRepository.list_confirmed_by_trip(db, trip_id)
+    return [
+        PassengerOut(
+            **UserOut.model_validate(r.user).model_dump(),
+            seats=r.seats,
+            passenger_names=r.passenger_names,
+        )
+        for r in reservations
+    ]
@@ -0,0 +1,92 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.domain.schemas import WaitlistEntryCreate, WaitlistEntryOut, WaitlistPosition
+from src.domain.models import User, WaitlistEntry
+from src.infra.database import get_db
+from src.infra.auth import get_current_active_user
+from src.infra.repositories import ReservationRepository, TripRepository, WaitlistRepository
+
+router = APIRouter()
+
+@router.post("/trips/{trip_id}/waitlist/", response_model=WaitlistEntryOut, status_code=status.HTTP_201_CREATED)
+async def join_waitlist(
+    trip_id: int,
+    entry_in: Optional[WaitlistEntryCreate] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    entry_in = entry_in or WaitlistEntryCreate()
+
+    trip = await TripRepository.get_by_id(db, trip_id)
+    if not trip:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Viagem não encontrada.")
+
+    if trip.available_seats >= entry_in.seats:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A viagem ainda tem vagas disponíveis; faça a reserva diretamente."
+        )
+
+    if await ReservationRepository.get_confirmed(db, trip_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Você já tem uma reserva para esta viagem."
+        )
+
+    try:
+        entry = await WaitlistRepository.create(
+            db,
+            WaitlistEntry(
+                user_id=current_user.id,
+                trip_id=trip_id,
+                seats=entry_in.seats,
+                passenger_names=entry_in.passenger_names,
+            ),
+            commit=False,
+        )
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Você já está na lista de espera desta viagem."
+        )
+
+    # Uma vaga pode ter sido liberada entre a checagem acima e o insert, sem ninguém na fila
+    # para recebê-la: promove na mesma transação para a vaga não ficar parada.
+    promoted = await WaitlistRepository.promote(db, trip_id)
+    await db.commit()
+
+    reservation = next((r for r in promoted if r.user_id == current_user.id), None)
+    position = 0 if reservation else await WaitlistRepository.get_position(db, trip_id, current_user.id)
+    return WaitlistEntryOut(
+        id=entry.id,
+        user_id=entry.user_id,
+        trip_id=entry.trip_id,
+        seats=entry.seats,
+        passenger_names=entry.passenger_names,
+        created_at=entry.created_at,
+        position=position,
+        reservation_id=reservation.id if reservation else None,
+    )
+
+@router.get("/trips/{trip_id}/waitlist/position/", response_model=WaitlistPosition)
+async def get_waitlist_position(trip_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+    position = await WaitlistRepository.get_position(db, trip_id, current_user.id)
+    if not position:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Você não está na lista de espera desta viagem."
+        )
+    return WaitlistPosition(trip_id=trip_id, position=position)
+
+@router.delete("/trips/{trip_id}/waitlist/", status_code=status.HTTP_204_NO_CONTENT)
+async def leave_waitlist(trip_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+    if not await WaitlistRepository.get(db, trip_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Você não está na lista de espera desta viagem."
+        )
+    await WaitlistRepository.delete(db, trip_id, current_user.id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
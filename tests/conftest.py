@@ -0,0 +1,53 @@
+import os
+import tempfile
+
+# Os testes rodam contra um SQLite temporário (aiosqlite) no lugar do Postgres; o
+# DATABASE_URL precisa estar definido antes de qualquer import de src.infra.database.
+# Sobrescreve qualquer valor do ambiente: o fixture `client` recria as tabelas com drop_all.
+_db_path = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+
+import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from src.domain.models import Base
+from src.infra import rate_limit
+from src.infra.database import DATABASE_URL
+from src.infra.rate_limit import InMemoryBackend
+from src.main import app
+
+sync_engine = create_engine(DATABASE_URL.replace("+aiosqlite", ""))
+
+
+@pytest.fixture
+def client():
+    Base.metadata.drop_all(sync_engine)
+    Base.metadata.create_all(sync_engine)
+    rate_limit.set_backend(InMemoryBackend())
+    with TestClient(app, base_url="http://test/api/v1") as client:
+        yield client
+
+
+def auth_headers(client, username, is_driver=False):
+    client.post("/register/", json={
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": "secret",
+        "is_driver": is_driver,
+    })
+    token = client.post("/token/", data={"username": username, "password": "secret"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def create_trip(client, headers, seats, hour=10):
+    response = client.post("/trips/", headers=headers, json={
+        "origin": "Recife",
+        "destination": "Caruaru",
+        "date": (datetime.date.today() + datetime.timedelta(days=3)).isoformat(),
+        "time": f"{hour:02d}:00:00",
+        "available_seats": seats,
+    })
+    return response.json()
@@ -0,0 +1,57 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from src import main
+from src.main import app
+from src.presentation import health_check
+
+
+class FlakyWarmUp:
+    """Substitui `warm_up`: falha até `succeed` virar True."""
+
+    def __init__(self):
+        self.succeed = False
+        self.calls = 0
+
+    async def __call__(self, *warmers, **kwargs):
+        self.calls += 1
+        return self.succeed
+
+
+def wait_for_ready(client, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get("/ready/")
+        if response.status_code == 200:
+            return response
+        time.sleep(0.01)
+    return response
+
+
+def test_ready_waits_for_background_warm_up_while_health_stays_up(monkeypatch):
+    warm_up = FlakyWarmUp()
+    monkeypatch.setattr(main, "warm_up", warm_up)
+    monkeypatch.setattr(main, "DB_WARMUP_RETRY_SECONDS", 0.01)
+
+    with TestClient(app, base_url="http://test/api/v1") as client:
+        assert client.get("/ready/").status_code == 503
+        assert client.get("/health/").status_code == 200
+
+        warm_up.succeed = True
+        response = wait_for_ready(client)
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+    assert warm_up.calls >= 2
+
+
+def test_ready_is_503_when_database_stops_answering(client, monkeypatch):
+    async def unreachable(timeout=None):
+        return False
+
+    assert client.get("/ready/").status_code == 200
+
+    monkeypatch.setattr(health_check, "ping", unreachable)
+    assert client.get("/ready/").status_code == 503
+    assert client.get("/health/").status_code == 200
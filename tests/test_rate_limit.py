@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.domain.models import User
+from src.infra import rate_limit
+from src.infra.auth import get_current_active_user
+from src.infra.rate_limit import InMemoryBackend, RateLimitBackend, RateLimiter, UserRateLimiter, client_ip
+from starlette.requests import Request
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSharedBackend(RateLimitBackend):
+    """Stand-in de um store compartilhado: registra as chaves e nega a partir do limite."""
+
+    def __init__(self, allow: int):
+        self.allow = allow
+        self.keys = []
+
+    async def consume(self, key, capacity, refill_rate):
+        self.keys.append(key)
+        return 0 if self.keys.count(key) <= self.allow else 7.2
+
+
+@pytest.fixture
+def backend():
+    previous = rate_limit.backend
+    rate_limit.set_backend(InMemoryBackend())
+    yield rate_limit.backend
+    rate_limit.set_backend(previous)
+
+
+def make_app(limiter) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/limited/", dependencies=[Depends(limiter)])
+    async def limited():
+        return {"ok": True}
+
+    return app
+
+
+def test_in_memory_backend_denies_when_empty_and_refills():
+    clock = FakeClock()
+    backend = InMemoryBackend(clock=clock)
+    consume = lambda: asyncio.run(backend.consume("k", 2, 0.5))
+
+    assert consume() == 0
+    assert consume() == 0
+    assert consume() == pytest.approx(2.0)
+
+    clock.now += 1
+    assert consume() == pytest.approx(1.0)
+
+    clock.now += 1
+    assert consume() == 0
+    assert consume() == pytest.approx(2.0)
+
+
+def test_in_memory_backend_refill_is_capped_at_capacity():
+    clock = FakeClock()
+    backend = InMemoryBackend(clock=clock)
+    asyncio.run(backend.consume("k", 2, 1.0))
+
+    clock.now += 100
+    results = [asyncio.run(backend.consume("k", 2, 1.0)) for _ in range(3)]
+
+    assert results[:2] == [0, 0]
+    assert results[2] > 0
+
+
+def test_in_memory_backend_sweeps_refilled_buckets():
+    clock = FakeClock()
+    backend = InMemoryBackend(clock=clock, sweep_every=2)
+    asyncio.run(backend.consume("old", 1, 1.0))
+
+    clock.now += 10
+    asyncio.run(backend.consume("new", 1, 1.0))
+
+    assert set(backend._buckets) == {"new"}
+
+
+def test_returns_429_with_retry_after(backend):
+    client = TestClient(make_app(RateLimiter("test", "2/60")))
+
+    assert client.post("/limited/").status_code == 200
+    assert client.post("/limited/").status_code == 200
+    response = client.post("/limited/")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+
+
+def make_request(forwarded=None, peer="10.0.0.9"):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 1234)})
+
+
+def test_client_ip_returns_entry_appended_by_ingress_with_one_hop():
+    # O cliente mandou "6.6.6.6"; o ingress acrescentou o IP real da conexão dele.
+    request = make_request("6.6.6.6, 203.0.113.7")
+
+    assert client_ip(request, trusted_hops=1) == "203.0.113.7"
+
+
+def test_client_ip_uses_connection_when_header_is_shorter_than_hops():
+    assert client_ip(make_request("203.0.113.7"), trusted_hops=2) == "10.0.0.9"
+    assert client_ip(make_request(), trusted_hops=1) == "10.0.0.9"
+
+
+def test_client_ip_ignores_header_without_trusted_hops():
+    assert client_ip(make_request("203.0.113.7"), trusted_hops=0) == "10.0.0.9"
+
+
+def test_limits_per_ip_using_trusted_hops(backend, monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUSTED_HOPS", 1)
+    client = TestClient(make_app(RateLimiter("test", "1/60")))
+
+    # A entrada mais à esquerda é do cliente e não muda a chave; a da direita vem do proxy.
+    assert client.post("/limited/", headers={"X-Forwarded-For": "1.2.3.1, 10.0.0.1"}).status_code == 200
+    assert client.post("/limited/", headers={"X-Forwarded-For": "1.2.3.2, 10.0.0.1"}).status_code == 429
+    assert client.post("/limited/", headers={"X-Forwarded-For": "1.2.3.3, 10.0.0.2"}).status_code == 200
+
+
+def test_ignores_forwarded_header_without_trusted_hops(backend, monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUSTED_HOPS", 0)
+    client = TestClient(make_app(RateLimiter("test", "1/60")))
+
+    assert client.post("/limited/", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 200
+    assert client.post("/limited/", headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 429
+
+
+def test_limits_per_user(backend):
+    app = make_app(UserRateLimiter("test", "1/60"))
+    current = {"user": User(id=1)}
+    app.dependency_overrides[get_current_active_user] = lambda: current["user"]
+    client = TestClient(app)
+
+    assert client.post("/limited/").status_code == 200
+    assert client.post("/limited/").status_code == 429
+
+    current["user"] = User(id=2)
+    assert client.post("/limited/").status_code == 200
+
+
+def test_uses_backend_registered_with_set_backend():
+    previous = rate_limit.backend
+    shared = FakeSharedBackend(allow=1)
+    rate_limit.set_backend(shared)
+    try:
+        client = TestClient(make_app(RateLimiter("login", "100/60")))
+
+        assert client.post("/limited/").status_code == 200
+        response = client.post("/limited/")
+    finally:
+        rate_limit.set_backend(previous)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "8"
+    assert shared.keys == ["login:ip:testclient", "login:ip:testclient"]
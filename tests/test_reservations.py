@@ -0,0 +1,166 @@
+from types import SimpleNamespace
+
+from sqlalchemy import text
+
+from src.infra.repositories import ReservationRepository, TripRepository
+from tests.conftest import auth_headers, create_trip, sync_engine
+
+
+def test_reserve_response_shows_decremented_seats(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    passenger = auth_headers(client, "passenger")
+    trip = create_trip(client, driver, seats=1)
+
+    response = client.post(f"/trips/{trip['id']}/reserve/", headers=passenger)
+
+    assert response.status_code == 200
+    assert response.json()["trip"]["available_seats"] == 0
+
+
+def test_edit_response_shows_decremented_seats_on_new_trip(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    passenger = auth_headers(client, "passenger")
+    old_trip = create_trip(client, driver, seats=3, hour=10)
+    new_trip = create_trip(client, driver, seats=2, hour=12)
+    reservation = client.post(
+        f"/trips/{old_trip['id']}/reserve/", headers=passenger, json={"seats": 2}
+    ).json()
+
+    response = client.put(
+        f"/reservations/{reservation['id']}/edit/", headers=passenger, json={"new_trip_id": new_trip["id"]}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["trip"]["id"] == new_trip["id"]
+    assert response.json()["trip"]["available_seats"] == 0
+    assert client.get(f"/trips/{old_trip['id']}/").json()["available_seats"] == 3
+
+
+def test_group_booking_is_all_or_nothing(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    passenger = auth_headers(client, "passenger")
+    trip = create_trip(client, driver, seats=2)
+
+    response = client.post(f"/trips/{trip['id']}/reserve/", headers=passenger, json={"seats": 3})
+
+    assert response.status_code == 400
+    assert client.get("/reservations/", headers=passenger).json() == []
+    assert client.get(f"/trips/{trip['id']}/").json()["available_seats"] == 2
+
+
+def test_group_booking_inserts_nothing_when_seats_are_gone_after_check(client, monkeypatch):
+    driver = auth_headers(client, "driver", is_driver=True)
+    passenger = auth_headers(client, "passenger")
+    trip = create_trip(client, driver, seats=2)
+
+    # A checagem ainda vê vagas de sobra; o decremento condicional no banco é quem decide.
+    async def stale_trip(db, trip_id):
+        return SimpleNamespace(id=trip_id, available_seats=5)
+    monkeypatch.setattr(TripRepository, "get_by_id", stale_trip)
+    response = client.post(f"/trips/{trip['id']}/reserve/", headers=passenger, json={"seats": 3})
+    monkeypatch.undo()
+
+    assert response.status_code == 400
+    assert client.get("/reservations/", headers=passenger).json() == []
+    assert client.get(f"/trips/{trip['id']}/").json()["available_seats"] == 2
+
+
+def test_partial_cancel_trims_names_and_serves_waitlist_first(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    family, waiting = auth_headers(client, "family"), auth_headers(client, "waiting")
+    trip = create_trip(client, driver, seats=3)
+    reservation = client.post(
+        f"/trips/{trip['id']}/reserve/", headers=family,
+        json={"seats": 3, "passenger_names": ["Ana", "Bia", "Caio"]},
+    ).json()
+    client.post(f"/trips/{trip['id']}/waitlist/", headers=waiting)
+
+    response = client.put(f"/reservations/{reservation['id']}/cancel/", headers=family, json={"seats": 2})
+
+    assert response.status_code == 204
+    [remaining] = client.get("/reservations/", headers=family).json()
+    assert remaining["status"] == "CONFIRMED"
+    assert remaining["seats"] == 1
+    assert remaining["passenger_names"] == ["Ana"]
+    assert [r["status"] for r in client.get("/reservations/", headers=waiting).json()] == ["CONFIRMED"]
+    assert client.get(f"/trips/{trip['id']}/").json()["available_seats"] == 1
+
+
+def test_partial_cancel_of_every_seat_cancels_the_reservation(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    family = auth_headers(client, "family")
+    trip = create_trip(client, driver, seats=3)
+    reservation = client.post(f"/trips/{trip['id']}/reserve/", headers=family, json={"seats": 2}).json()
+
+    response = client.put(f"/reservations/{reservation['id']}/cancel/", headers=family, json={"seats": 2})
+
+    assert response.status_code == 204
+    [cancelled] = client.get("/reservations/", headers=family).json()
+    assert cancelled["status"] == "CANCELLED"
+    assert cancelled["seats"] == 2
+    assert client.get(f"/trips/{trip['id']}/").json()["available_seats"] == 3
+
+
+def test_cancel_conflicts_when_reservation_changed_after_read(client, monkeypatch):
+    driver = auth_headers(client, "driver", is_driver=True)
+    family = auth_headers(client, "family")
+    trip = create_trip(client, driver, seats=3)
+    reservation = client.post(f"/trips/{trip['id']}/reserve/", headers=family, json={"seats": 3}).json()
+
+    # Outra requisição tira assentos da reserva entre a leitura e o UPDATE condicional.
+    get_by_id = ReservationRepository.get_by_id
+    async def read_then_change(db, reservation_id):
+        found = await get_by_id(db, reservation_id)
+        with sync_engine.begin() as conn:
+            conn.execute(text("UPDATE reservations SET seats = 1"))
+        return found
+    monkeypatch.setattr(ReservationRepository, "get_by_id", read_then_change)
+    response = client.put(f"/reservations/{reservation['id']}/cancel/", headers=family, json={"seats": 2})
+    monkeypatch.undo()
+
+    assert response.status_code == 409
+    [unchanged] = client.get("/reservations/", headers=family).json()
+    assert unchanged["status"] == "CONFIRMED"
+    assert unchanged["seats"] == 1
+    assert client.get(f"/trips/{trip['id']}/").json()["available_seats"] == 0
+
+
+def test_group_on_waitlist_is_promoted_once_all_seats_fit(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    a, b, family = (auth_headers(client, name) for name in ("a", "b", "family"))
+    trip = create_trip(client, driver, seats=2)
+    reservation_a = client.post(f"/trips/{trip['id']}/reserve/", headers=a).json()
+    reservation_b = client.post(f"/trips/{trip['id']}/reserve/", headers=b).json()
+    response = client.post(
+        f"/trips/{trip['id']}/waitlist/", headers=family, json={"seats": 2, "passenger_names": ["Ana", "Bia"]}
+    )
+    assert response.status_code == 201
+    assert response.json()["seats"] == 2
+
+    client.put(f"/reservations/{reservation_a['id']}/cancel/", headers=a)
+    assert client.get("/reservations/", headers=family).json() == []
+    assert client.get(f"/trips/{trip['id']}/").json()["available_seats"] == 1
+
+    client.put(f"/reservations/{reservation_b['id']}/cancel/", headers=b)
+    [promoted] = client.get("/reservations/", headers=family).json()
+    assert promoted["seats"] == 2
+    assert promoted["passenger_names"] == ["Ana", "Bia"]
+    assert client.get(f"/trips/{trip['id']}/").json()["available_seats"] == 0
+
+
+def test_passengers_list_skips_cancelled_reservations(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    a, b = auth_headers(client, "a"), auth_headers(client, "b")
+    trip = create_trip(client, driver, seats=3)
+    client.post(f"/trips/{trip['id']}/reserve/", headers=a, json={"seats": 2, "passenger_names": ["Ana", "Bia"]})
+    reservation_b = client.post(f"/trips/{trip['id']}/reserve/", headers=b).json()
+    client.put(f"/reservations/{reservation_b['id']}/cancel/", headers=b)
+
+    response = client.get(f"/trips/{trip['id']}/passengers/", headers=driver)
+
+    assert response.status_code == 200
+    [passenger] = response.json()
+    assert passenger["username"] == "a"
+    assert passenger["email"] == "a@example.com"
+    assert passenger["seats"] == 2
+    assert passenger["passenger_names"] == ["Ana", "Bia"]
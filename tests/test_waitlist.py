@@ -0,0 +1,156 @@
+from types import SimpleNamespace
+
+from sqlalchemy import text
+
+from src.infra.repositories import TripRepository
+from tests.conftest import auth_headers, create_trip, sync_engine
+
+
+def join(client, trip, headers):
+    return client.post(f"/trips/{trip['id']}/waitlist/", headers=headers)
+
+
+def position(client, trip, headers):
+    return client.get(f"/trips/{trip['id']}/waitlist/position/", headers=headers)
+
+
+def confirmed_trip_ids(client, headers):
+    return [r["trip_id"] for r in client.get("/reservations/", headers=headers).json() if r["status"] == "CONFIRMED"]
+
+
+def test_cancel_promotes_first_in_line(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    a, b, c = (auth_headers(client, name) for name in ("a", "b", "c"))
+    trip = create_trip(client, driver, seats=1)
+    reservation = client.post(f"/trips/{trip['id']}/reserve/", headers=a).json()
+    assert join(client, trip, b).json()["position"] == 1
+    assert join(client, trip, c).json()["position"] == 2
+
+    response = client.put(f"/reservations/{reservation['id']}/cancel/", headers=a)
+
+    assert response.status_code == 204
+    assert confirmed_trip_ids(client, b) == [trip["id"]]
+    assert position(client, trip, b).status_code == 404
+    assert position(client, trip, c).json()["position"] == 1
+    assert client.get(f"/trips/{trip['id']}/").json()["available_seats"] == 0
+
+
+def test_position_follows_arrival_order(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    a, b, c, d = (auth_headers(client, name) for name in ("a", "b", "c", "d"))
+    trip = create_trip(client, driver, seats=1)
+    client.post(f"/trips/{trip['id']}/reserve/", headers=a)
+    for headers in (b, c, d):
+        join(client, trip, headers)
+
+    assert client.delete(f"/trips/{trip['id']}/waitlist/", headers=c).status_code == 204
+
+    assert position(client, trip, b).json()["position"] == 1
+    assert position(client, trip, c).status_code == 404
+    assert position(client, trip, d).json()["position"] == 2
+
+
+def test_join_is_rejected_while_seats_are_free_or_twice(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    a, b = auth_headers(client, "a"), auth_headers(client, "b")
+    trip = create_trip(client, driver, seats=1)
+    assert join(client, trip, b).status_code == 400
+
+    client.post(f"/trips/{trip['id']}/reserve/", headers=a)
+    assert join(client, trip, b).status_code == 201
+    assert join(client, trip, b).status_code == 400
+    assert join(client, trip, a).status_code == 400
+
+
+def test_join_takes_seat_released_after_availability_check(client, monkeypatch):
+    driver = auth_headers(client, "driver", is_driver=True)
+    b = auth_headers(client, "b")
+    trip = create_trip(client, driver, seats=1)
+
+    # Simula a corrida: a checagem ainda vê a viagem lotada, mas a vaga já foi liberada no banco.
+    async def full_trip(db, trip_id):
+        return SimpleNamespace(id=trip_id, available_seats=0)
+    monkeypatch.setattr(TripRepository, "get_by_id", full_trip)
+    response = join(client, trip, b)
+    monkeypatch.undo()
+
+    assert response.status_code == 201
+    assert response.json()["position"] == 0
+    assert response.json()["reservation_id"] is not None
+    assert confirmed_trip_ids(client, b) == [trip["id"]]
+    assert client.get(f"/trips/{trip['id']}/").json()["available_seats"] == 0
+
+
+def test_edit_promotes_waitlist_on_original_trip(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    a, b = auth_headers(client, "a"), auth_headers(client, "b")
+    old_trip = create_trip(client, driver, seats=1, hour=10)
+    new_trip = create_trip(client, driver, seats=1, hour=12)
+    reservation = client.post(f"/trips/{old_trip['id']}/reserve/", headers=a).json()
+    join(client, old_trip, b)
+
+    response = client.put(
+        f"/reservations/{reservation['id']}/edit/", headers=a, json={"new_trip_id": new_trip["id"]}
+    )
+
+    assert response.status_code == 200
+    assert confirmed_trip_ids(client, b) == [old_trip["id"]]
+    assert client.get(f"/trips/{old_trip['id']}/").json()["available_seats"] == 0
+
+
+def test_update_trip_promotes_waitlist_with_new_seats(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    a, b, c = (auth_headers(client, name) for name in ("a", "b", "c"))
+    trip = create_trip(client, driver, seats=1)
+    client.post(f"/trips/{trip['id']}/reserve/", headers=a)
+    join(client, trip, b)
+    join(client, trip, c)
+    payload = {key: trip[key] for key in ("origin", "destination", "date", "time")}
+
+    response = client.put(f"/trips/{trip['id']}/", headers=driver, json={**payload, "available_seats": 3})
+
+    assert response.status_code == 200
+    assert response.json()["available_seats"] == 1
+    assert confirmed_trip_ids(client, b) == [trip["id"]]
+    assert confirmed_trip_ids(client, c) == [trip["id"]]
+
+    response = client.put(f"/trips/{trip['id']}/", headers=driver, json={**payload, "available_seats": -1})
+    assert response.status_code == 422
+
+
+def test_promote_drops_entries_of_users_already_confirmed(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    a, b, c = (auth_headers(client, name) for name in ("a", "b", "c"))
+    trip = create_trip(client, driver, seats=1)
+    reservation = client.post(f"/trips/{trip['id']}/reserve/", headers=a).json()
+    join(client, trip, b)
+    join(client, trip, c)
+    # Entrada obsoleta: b ganhou uma reserva confirmada por fora, sem sair da fila.
+    with sync_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO reservations (user_id, trip_id, status, seats) "
+            "SELECT user_id, trip_id, 'CONFIRMED', 1 FROM waitlist_entries ORDER BY id LIMIT 1"
+        ))
+
+    client.put(f"/reservations/{reservation['id']}/cancel/", headers=a)
+
+    assert confirmed_trip_ids(client, b) == [trip["id"]]
+    assert confirmed_trip_ids(client, c) == [trip["id"]]
+    assert position(client, trip, b).status_code == 404
+    assert client.get(f"/trips/{trip['id']}/").json()["available_seats"] == 0
+
+
+def test_direct_booking_leaves_the_waitlist(client):
+    driver = auth_headers(client, "driver", is_driver=True)
+    a, b = auth_headers(client, "a"), auth_headers(client, "b")
+    trip = create_trip(client, driver, seats=1)
+    client.post(f"/trips/{trip['id']}/reserve/", headers=a)
+    join(client, trip, b)
+    # Vaga aberta sem passar pela promoção, como numa edição manual no banco.
+    with sync_engine.begin() as conn:
+        conn.execute(text("UPDATE trips SET available_seats = 1"))
+
+    response = client.post(f"/trips/{trip['id']}/reserve/", headers=b)
+
+    assert response.status_code == 200
+    assert position(client, trip, b).status_code == 404